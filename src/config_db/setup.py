@@ -24,7 +24,7 @@ setup(
     url='http://gitlab.com/ska-telescope/sdp-prototype/src/'
         'config_db',
     install_requires=[
-        'etcd3-py', 'docopt-ng', 'kubernetes'
+        'etcd3-py', 'kubernetes'
     ],
     classifiers=[
         'Topic :: Database :: Front-Ends',
@@ -164,6 +164,54 @@ class Etcd3():
         ])
         return (sorted_keys, revision)
 
+    def list_range(self, path, recurse=0, revision=None):
+        """
+        List keys and values under given path.
+
+        Mirrors :meth:`list_keys`, except that values get returned
+        from the same range request instead of requiring a separate
+        :meth:`get` round trip per key.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Maximum recursion level to query. If iterable,
+           cover exactly the recursion levels specified.
+        :param revision: Database revision for which to list
+        :returns: (sorted list of (key, value, mod_revision) triples,
+            revision)
+        """
+        # Prepare parameters
+        path_depth = path.count('/')
+        rev = None
+        if revision is not None:
+            rev = revision.revision
+
+        # Make transaction to collect key/value pairs from all levels
+        txn = self._client.Txn()
+        try:
+            depth_iter = iter(recurse)
+        except TypeError:
+            depth_iter = range(recurse+1)
+        for depth in depth_iter:
+            tagged_path = _tag_depth(path, depth+path_depth)
+            txn.success(txn.range(tagged_path, prefix=True, revision=rev))
+        response = txn.commit()
+
+        revision = Etcd3Revision(response.header.revision, None)
+        if response.responses is None:
+            return ([], revision)
+
+        # Collect and sort key/value pairs
+        sorted_kvs = sorted([
+            (_untag_depth(kv.key.decode('utf-8')),
+             kv.value.decode('utf-8'),
+             kv.mod_revision)
+            for res in response.responses
+            if res.response_range.kvs is not None
+            for kv in res.response_range.kvs
+        ])
+        return (sorted_kvs, revision)
+
     def create(self, path, value, lease=None):
         """Create a key and initialise it with the value.
 
@@ -503,6 +551,52 @@ class Etcd3Transaction():
         # Sort
         return sorted(keys)
 
+    def list_range(self, path, recurse=0):
+        """
+        List keys and their values under given path.
+
+        The values are read in the same backend request as the key
+        list, so this is cheaper than calling :meth:`get` once per key
+        returned by :meth:`list_keys`.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Children depths to include in search
+        :returns: sorted list of (key, value) pairs
+        """
+        self._ensure_uncommitted()
+        path_depth = path.count('/')
+
+        # Determine depths to query
+        try:
+            depth_iter = iter(recurse)
+        except TypeError:
+            depth_iter = range(recurse+1)
+        depths = [path_depth+depth for depth in depth_iter]
+
+        # Perform a ranged read for every depth not yet covered by the
+        # query log, caching the returned values as if they had been
+        # queried individually.
+        for depth in depths:
+            if (path, depth) in self._list_queries:
+                continue
+            result, rev = self._backend.list_range(
+                path, recurse=(depth-path_depth,), revision=self._revision)
+            if self._revision is None:
+                self._revision = rev
+            self._list_queries[(path, depth)] = \
+                ([kv[0] for kv in result], rev)
+            for key, value, mod_revision in result:
+                if key not in self._get_queries:
+                    self._get_queries[key] = \
+                        (value, Etcd3Revision(rev.revision, mod_revision))
+
+        # Assemble result. Going through list_keys() and get() makes
+        # sure uncommitted updates are taken into account - all values
+        # will be served from the query log populated above.
+        keys = self.list_keys(path, recurse=[d-path_depth for d in depths])
+        return [(key, self.get(key)) for key in keys]
+
     def create(self, path, value, lease=None):
         """Create a key and initialise it with the value.
 
@@ -27,16 +27,16 @@ Environment Variables:
 
 # pylint: disable=E1111,R0912
 
+import argparse
 import os
 import sys
 import re
-import tempfile
 import json
-import subprocess
-import docopt
-import yaml
 from ska_sdp_config import entity, config
 
+# Characters permitted in database paths
+_PATH_RE = re.compile(r'^[a-zA-Z0-9_\-/]*$')
+
 
 def cmd_get(txn, path, args):
     """Get raw value from database."""
@@ -50,19 +50,19 @@ def cmd_get(txn, path, args):
 def cmd_list(txn, path, args):
     """List raw keys/values from database."""
     recurse = (8 if args['-R'] else 0)
-    keys = txn.raw.list_keys(path, recurse=recurse)
-    if args['--quiet']:
-        if args['values']:
-            values = [txn.raw.get(key) for key in keys]
-            print(" ".join(values))
+    if args['values']:
+        # Batched read - one range request instead of one get per key
+        pairs = txn.raw.list_range(path, recurse=recurse)
+        if args['--quiet']:
+            print(" ".join(value for _, value in pairs))
         else:
-            print(" ".join(keys))
-    else:
-        if args['values']:
             print("Keys with {} prefix:".format(path))
-            for key in keys:
-                value = txn.raw.get(key)
+            for key, value in pairs:
                 print("{} = {}".format(key, value))
+    else:
+        keys = txn.raw.list_keys(path, recurse=recurse)
+        if args['--quiet']:
+            print(" ".join(keys))
         else:
             print("Keys with {} prefix: {}".format(path, ", ".join(keys)))
 
@@ -79,6 +79,11 @@ def cmd_update(txn, path, value, _args):
 
 def cmd_edit(txn, path):
     """Edit the value of a raw key."""
+    # Only import these when needed - this is not a hot code path
+    import tempfile
+    import subprocess
+    import yaml
+
     val = txn.raw.get(path)
     try:
 
@@ -128,6 +133,8 @@ def cmd_delete(txn, path, args):
 
 def cmd_create_pb(txn, workflow, parameters, _args):
     """Create a processing block."""
+    import yaml
+
     # Parse parameters
     if parameters is not None:
         pars = yaml.safe_load(parameters)
@@ -143,25 +150,139 @@ def cmd_create_pb(txn, workflow, parameters, _args):
 
 def cmd_deploy(txn, typ, deploy_id, parameters):
     """Create a deployment."""
+    import yaml
+
     dct = yaml.safe_load(parameters)
     txn.create_deployment(entity.Deployment(deploy_id, typ, dct))
 
 
+def _build_parser():
+    """Build the command line parser.
+
+    This happens once at module load, so repeated :func:`main` calls
+    (and one-shot command invocations) do not pay for re-parsing the
+    usage grammar as they did with docopt.
+
+    :returns: argparse.ArgumentParser instance
+    """
+    parser = argparse.ArgumentParser(
+        prog='sdpcfg', description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help='Cut back on unneccesary output')
+    parser.add_argument('--prefix', help='Path prefix for high-level API')
+    subparsers = parser.add_subparsers(dest='cmd')
+    subparsers.required = True
+
+    parser_get = subparsers.add_parser(
+        'get', help='Get raw value from database')
+    parser_get.add_argument('path', metavar='<path>')
+    parser_watch = subparsers.add_parser(
+        'watch', help='Watch raw value in database')
+    parser_watch.add_argument('path', metavar='<path>')
+    parser_list = subparsers.add_parser(
+        'ls', aliases=['list'], help='List raw keys/values from database')
+    parser_list.add_argument('-R', dest='recursive', action='store_true',
+                             help='List recursively')
+    parser_list.add_argument('path', metavar='<path>')
+    parser_delete = subparsers.add_parser('delete', help='Delete a key')
+    parser_delete.add_argument('-R', dest='recursive', action='store_true',
+                               help='Delete recursively')
+    parser_delete.add_argument('path', metavar='<path>')
+    parser_create = subparsers.add_parser('create', help='Create raw key')
+    parser_create.add_argument('path', metavar='<path>')
+    parser_create.add_argument('value', metavar='<value>')
+    parser_update = subparsers.add_parser(
+        'update', help='Update raw key value')
+    parser_update.add_argument('path', metavar='<path>')
+    parser_update.add_argument('value', metavar='<value>')
+    parser_edit = subparsers.add_parser(
+        'edit', help='Edit the value of a raw key')
+    parser_edit.add_argument('path', metavar='<path>')
+    parser_process = subparsers.add_parser(
+        'process', help='Create a processing block')
+    parser_process.add_argument('workflow', metavar='<workflow>')
+    parser_process.add_argument('parameters', metavar='<parameters>',
+                                nargs='?')
+    parser_deploy = subparsers.add_parser(
+        'deploy', help='Create a deployment')
+    parser_deploy.add_argument('type', metavar='<type>')
+    parser_deploy.add_argument('name', metavar='<name>')
+    parser_deploy.add_argument('parameters', metavar='<parameters>')
+    return parser
+
+
+_PARSER = _build_parser()
+
+# Command names recognised by the parser, for building the docopt-style
+# argument dictionary used for dispatch.
+_COMMANDS = ('get', 'watch', 'ls', 'list', 'delete', 'create', 'update',
+             'edit', 'process', 'deploy')
+
+
+def parse_args(argv):
+    """Parse command line arguments into a docopt-style dictionary.
+
+    :param argv: Argument list
+    :returns: Dictionary of commands, options and parameter values
+    """
+    # 'watch' can prefix 'ls'/'list' to watch a key range, and 'ls'/'list'
+    # can be followed by a literal 'values' token. Pull both out before
+    # parsing, as argparse does not support optional literal tokens.
+    argv = list(argv)
+    watch_list = False
+    list_values = False
+    for i, arg in enumerate(argv):
+        if arg.startswith('-'):
+            continue
+        if arg == 'watch' and any(a in ('ls', 'list') for a in argv[i+1:]):
+            del argv[i]
+            watch_list = True
+            arg = argv[i]
+        if arg in ('ls', 'list') and 'values' in argv[i+1:]:
+            argv.remove('values')
+            list_values = True
+        break
+
+    parsed = _PARSER.parse_args(argv)
+    args = {command: False for command in _COMMANDS}
+    args[parsed.cmd] = True
+    if watch_list:
+        args['watch'] = True
+    args.update({
+        '--quiet': parsed.quiet,
+        '--prefix': parsed.prefix,
+        '-R': getattr(parsed, 'recursive', False),
+        'values': list_values,
+        '<path>': getattr(parsed, 'path', None),
+        '<value>': getattr(parsed, 'value', None),
+        '<workflow>': getattr(parsed, 'workflow', None),
+        '<parameters>': getattr(parsed, 'parameters', None),
+        '<type>': getattr(parsed, 'type', None),
+        '<name>': getattr(parsed, 'name', None),
+    })
+    return args
+
+
 def main(argv):
     """Command line interface implementation."""
-    args = docopt.docopt(__doc__, argv=argv)
+    args = parse_args(argv)
 
     # Validate
     path = args["<path>"]
     success = True
     if path is not None:
-        if path[0] != '/':
+        if not path.startswith('/'):
             print("Path must start with '/'!", file=sys.stderr)
             success = False
-        if args['list'] is None and path[-1] == '/':
+        # Commands operating on a key range can take a prefix ending
+        # with '/'; commands addressing a single key cannot.
+        is_range = args['ls'] or args['list'] or \
+            (args['delete'] and args['-R'])
+        if not is_range and path.endswith('/'):
             print("Key path must not end with '/'!", file=sys.stderr)
             success = False
-        if not re.match('^[a-zA-Z0-9_\\-/]*$', path):
+        if not _PATH_RE.match(path):
             print("Path contains non-permissable characters!", file=sys.stderr)
             success = False
     workflow = args['<workflow>']
@@ -192,31 +313,52 @@ def main(argv):
     cmd(args, path, value, workflow, parameters)
 
 
+def _pick_handler(args, path, value, workflow, parameters):
+    """Look up the handler for the given command.
+
+    :param args: Parsed command line arguments
+    :param path: Path argument
+    :param value: Value argument
+    :param workflow: Workflow structure argument
+    :param parameters: Parameters argument
+    :returns: function executing the command, given a transaction
+    """
+    if args['ls'] or args['list']:
+        return lambda txn: cmd_list(txn, path, args)
+    if args['watch'] or args['get']:
+        return lambda txn: cmd_get(txn, path, args)
+    if args['create']:
+        return lambda txn: cmd_create(txn, path, value, args)
+    if args['edit']:
+        return lambda txn: cmd_edit(txn, path)
+    if args['update']:
+        return lambda txn: cmd_update(txn, path, value, args)
+    if args['delete']:
+        return lambda txn: cmd_delete(txn, path, args)
+    if args['process']:
+        return lambda txn: cmd_create_pb(txn, workflow, parameters, args)
+    if args['deploy']:
+        return lambda txn: cmd_deploy(txn, args['<type>'], args['<name>'],
+                                      parameters)
+    raise ValueError("Unknown command!")
+
+
 def cmd(args, path, value, workflow, parameters):
     """Execute command."""
     # Get configuration client, start transaction
     import ska_sdp_config
     prefix = ('' if args['--prefix'] is None else args['--prefix'])
     cfg = ska_sdp_config.Config(global_prefix=prefix)
+
+    # Bind the command handler once, so the transaction loop - which
+    # repeats indefinitely for watches - only has to call it.
+    handler = _pick_handler(args, path, value, workflow, parameters)
+    watch = args['watch']
     try:
+        result = None
         for txn in cfg.txn():
-            if args['ls'] or args['list']:
-                cmd_list(txn, path, args)
-            elif args['watch'] or args['get']:
-                cmd_get(txn, path, args)
-            elif args['create']:
-                cmd_create(txn, path, value, args)
-            elif args['edit']:
-                cmd_edit(txn, path)
-            elif args['update']:
-                cmd_update(txn, path, value, args)
-            elif args['delete']:
-                cmd_delete(txn, path, args)
-            elif args['process']:
-                pb_id = cmd_create_pb(txn, workflow, parameters, args)
-            elif args['deploy']:
-                cmd_deploy(txn, args['<type>'], args['<name>'], parameters)
-            if args['watch']:
+            result = handler(txn)
+            if watch:
                 txn.loop(wait=True)
 
         # Possibly give feedback after transaction has concluded
@@ -225,8 +367,8 @@ def cmd(args, path, value, workflow, parameters):
                args['edit']:
                 print("OK")
             if args['process']:
-                print("OK, pb_id = {}".format(pb_id))
+                print("OK, pb_id = {}".format(result))
 
     except KeyboardInterrupt:
-        if not args['watch']:
+        if not watch:
             raise
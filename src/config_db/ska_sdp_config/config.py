@@ -7,7 +7,7 @@ from datetime import date
 import json
 from socket import gethostname
 
-from . import backend as backend_mod, entity, deploy
+from . import backend as backend_mod, entity, memory_backend
 
 
 class Config():
@@ -18,15 +18,16 @@ class Config():
         """
         Connect to configuration using the given backend.
 
-        :param backend: Backend to use. Defaults to environment or etcd3 if
-            not set.
+        :param backend: Backend to use ('etcd3' or 'memory'). Defaults
+            to environment or etcd3 if not set.
         :param global_prefix: Prefix to use within the database
         :param owner: Dictionary used for identifying the process when claiming
             ownership.
         :param cargs: Backend client arguments
         """
         # Determine backend
-        backend = os.getenv('SDP_CONFIG_BACKEND', 'etcd3')
+        if backend is None:
+            backend = os.getenv('SDP_CONFIG_BACKEND', 'etcd3')
 
         # Instantiate backend, reading configuration from environment/dotenv
         if backend == 'etcd3':
@@ -44,6 +45,8 @@ class Config():
                 cargs['password'] = os.getenv('SDP_CONFIG_PASSWORD', None)
 
             self._backend = backend_mod.Etcd3(**cargs)
+        elif backend == 'memory':
+            self._backend = memory_backend.MemoryBackend()
         else:
             raise ValueError(
                 "Unknown configuration backend {}!".format(backend))
@@ -146,6 +149,7 @@ class Config():
         :param max_lines: Maximum number of lines to return (log tail)
         :returns: A list of the last log lines
         """
+        from . import deploy
         return deploy.get_deployment_logs(dpl, max_lines)
 
 
@@ -401,6 +405,10 @@ class Transaction():
 
         :param dpl: Deployment to add to database
         """
+        # Deferred so that simple queries do not pay for importing the
+        # deployment machinery (kubernetes client et al)
+        from . import deploy
+
         # Add to database
         assert isinstance(dpl, entity.Deployment)
         self._create(self._deploy_path + dpl.deploy_id,
@@ -416,6 +424,8 @@ class Transaction():
 
         :param dpl: Deployment to remove
         """
+        from . import deploy
+
         # Delete all data associated with deployment
         deploy_path = self._deploy_path + dpl.deploy_id
         for key in self._txn.list_keys(deploy_path, recurse=5):
@@ -0,0 +1,360 @@
+"""
+In-memory backend for SKA SDP configuration information.
+
+Implements a subset of the etcd3 backend interface, but keeps all data
+in process memory. This is mainly useful for testing and demonstration
+purposes, as it requires no database process. There is no persistence
+and watches are not supported. Accesses to the shared store are
+protected by a lock, so the backend can be used from multiple threads.
+"""
+
+import bisect
+import threading
+
+from .backend import Collision, Vanished
+
+
+def _tag_depth(path, depth=None):
+    """Add depth tag to path.
+
+    Works like the etcd3 backend tagging, except that we keep the
+    tagged path as a string - there is no database to talk to.
+    """
+    # All paths must start at the root
+    if not path or path[0] != '/':
+        raise ValueError("Path must start with /!")
+    if depth is None:
+        depth = path.count('/')
+    return "{}{}".format(depth, path)
+
+
+class MemoryLease():
+    """Dummy lease object.
+
+    Keys associated with the lease get deleted once the lease is
+    released at the end of a `with` block. This mimics the eventual
+    expiry of an etcd3 lease.
+    """
+
+    def __init__(self, backend):
+        """Initialise lease."""
+        self._backend = backend
+        self._paths = []
+
+    def register(self, path):
+        """Associate a key with the lease."""
+        self._paths.append(path)
+
+    def alive(self):
+        """Check whether lease is still alive."""
+        return True
+
+    def __enter__(self):
+        """Use for scoping lease to a block."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Use for scoping lease to a block."""
+        for path in self._paths:
+            self._backend.delete(path, must_exist=False)
+        self._paths = []
+        return False
+
+
+class MemoryBackend():
+    """In-memory database backend store.
+
+    The key store is shared process-wide, so separate client instances
+    see the same data - just as separate connections to one database
+    would.
+    """
+
+    # Tagged path -> value.
+    dict = {}
+
+    # Tagged paths in sorted order, so that range lookups can bisect
+    # (O(log N + k)) instead of scanning every key in the store.
+    _keys = []
+
+    # Guards accesses to the shared store. Check-then-act sequences
+    # such as create must be atomic across threads.
+    _lock = threading.RLock()
+
+    def lease(self, ttl=10):
+        """Generate a dummy lease object.
+
+        :param ttl: Time to live, ignored
+        :returns: lease object
+        """
+        # pylint: disable=unused-argument
+        return MemoryLease(self)
+
+    def txn(self, max_retries=64):
+        """Create a new transaction."""
+        # pylint: disable=unused-argument
+        return MemoryTransaction(self)
+
+    def get(self, path):
+        """
+        Get value of a key.
+
+        :param path: Path of key to query
+        :returns: Key value. None if it doesn't exist.
+        """
+        with self._lock:
+            return self.dict.get(_tag_depth(path))
+
+    def _check_exists(self, path):
+        """Check that the key exists, raise Vanished otherwise."""
+        if _tag_depth(path) not in self.dict:
+            raise Vanished(
+                path, "Cannot update {}, as it does not exist!".format(path))
+
+    def _check_not_exists(self, path):
+        """Check that the key does not exist, raise Collision otherwise."""
+        if _tag_depth(path) in self.dict:
+            raise Collision(
+                path, "Cannot create {}, as it already exists!".format(path))
+
+    def _put(self, path, value):
+        """Set key to value, irrespective of whether it exists."""
+        tag = _tag_depth(path)
+        if tag not in self.dict:
+            bisect.insort(self._keys, tag)
+        self.dict[tag] = str(value)
+
+    def _del(self, tag):
+        """Remove a tagged key from the store. Lock must be held."""
+        del self.dict[tag]
+        del self._keys[bisect.bisect_left(self._keys, tag)]
+
+    def create(self, path, value, lease=None):
+        """Create a key and initialise it with the value.
+
+        Fails if the key already exists.
+
+        :param path: Path to create
+        :param value: Value to set
+        :param lease: Lease to associate (ignored)
+        :raises: Collision
+        """
+        with self._lock:
+            self._check_not_exists(path)
+            self._put(path, value)
+        if lease is not None:
+            lease.register(path)
+
+    def update(self, path, value):
+        """
+        Update an existing key. Fails if the key does not exist.
+
+        :param path: Path to update
+        :param value: Value to set
+        :raises: Vanished
+        """
+        with self._lock:
+            self._check_exists(path)
+            self._put(path, value)
+
+    def _range(self, tag):
+        """List tagged keys with the given tag prefix, in order."""
+        low = bisect.bisect_left(self._keys, tag)
+        high = bisect.bisect_left(self._keys, tag + '\uffff')
+        return self._keys[low:high]
+
+    def list_keys(self, path, recurse=0):
+        """
+        List keys under given path.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Maximum recursion level to query. If iterable,
+           cover exactly the recursion levels specified.
+        :returns: sorted key list
+        """
+        path_depth = path.count('/')
+        try:
+            depth_iter = iter(recurse)
+        except TypeError:
+            depth_iter = range(recurse+1)
+        keys = []
+        with self._lock:
+            for depth in depth_iter:
+                tag = _tag_depth(path, depth+path_depth)
+                # All keys with this tag share the same depth prefix, so
+                # just slice it off instead of calling _untag_depth per
+                # key.
+                cut = len(tag) - len(path)
+                keys.extend(key[cut:] for key in self._range(tag))
+        return sorted(keys)
+
+    def list_range(self, path, recurse=0):
+        """
+        List keys and values under given path.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Maximum recursion level to query. If iterable,
+           cover exactly the recursion levels specified.
+        :returns: sorted list of (key, value) pairs
+        """
+        path_depth = path.count('/')
+        try:
+            depth_iter = iter(recurse)
+        except TypeError:
+            depth_iter = range(recurse+1)
+        pairs = []
+        with self._lock:
+            for depth in depth_iter:
+                tag = _tag_depth(path, depth+path_depth)
+                cut = len(tag) - len(path)
+                pairs.extend((key[cut:], self.dict[key])
+                             for key in self._range(tag))
+        return sorted(pairs)
+
+    def delete(self, path,
+               must_exist=True, recursive=False, prefix=False,
+               max_depth=16):
+        """
+        Delete the given key or key range.
+
+        :param path: Path (prefix) of keys to remove
+        :param must_exist: Fail if path does not exist?
+        :param recursive: Delete children keys at lower levels recursively
+        :param prefix: Delete all keys at given level with prefix
+        :raises: Vanished
+        """
+        tag = _tag_depth(path)
+        with self._lock:
+            self._delete(path, tag, must_exist, recursive, prefix, max_depth)
+
+    def _delete(self, path, tag, must_exist, recursive, prefix, max_depth):
+        """Delete the given key or key range. Lock must be held."""
+        if must_exist and tag not in self.dict:
+            raise Vanished(
+                path, "Cannot delete {}, as it does not exist!".format(path))
+        if prefix:
+            for key in self._range(tag):
+                self._del(key)
+        elif tag in self.dict:
+            self._del(tag)
+        if recursive:
+            depth = path.count('/')
+            for lvl in range(depth+1, depth+max_depth):
+                dtag = _tag_depth(path if prefix else path+'/', lvl)
+                for key in self._range(dtag):
+                    self._del(key)
+
+    def close(self):
+        """Close the client connection."""
+
+    def __enter__(self):
+        """Use for scoping client connection to a block."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Use for scoping client connection to a block."""
+        self.close()
+        return False
+
+
+class MemoryTransaction():
+    """Transaction wrapper around the in-memory backend.
+
+    Presents the same interface as :class:`Etcd3Transaction`, but as
+    the backing store is process-local, all operations take effect
+    immediately and the transaction trivially succeeds.
+    """
+
+    def __init__(self, backend):
+        """Initialise transaction."""
+        self.backend = backend
+        self._commit_callbacks = []
+
+    def __iter__(self):
+        """Iterate transaction, which trivially succeeds first time."""
+        yield self
+        self.commit()
+
+    def commit(self):
+        """Commit the transaction. Always succeeds."""
+        for callback in self._commit_callbacks:
+            callback()
+        self._commit_callbacks = []
+        return True
+
+    def on_commit(self, callback):
+        """Register a callback to call when the transaction succeeds.
+
+        :param callback: Callback to call
+        """
+        self._commit_callbacks.append(callback)
+
+    def loop(self, watch=False, watch_timeout=None):
+        """Repeat transaction execution.
+
+        This is a no-op for the in-memory backend, as watches are not
+        supported and transactions never fail.
+        """
+
+    def get(self, path):
+        """
+        Get value of a key.
+
+        :param path: Path of key to query
+        :returns: Key value. None if it doesn't exist.
+        """
+        return self.backend.get(path)
+
+    def list_keys(self, path, recurse=0):
+        """
+        List keys under given path.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Children depths to include in search
+        :returns: sorted key list
+        """
+        return self.backend.list_keys(path, recurse=recurse)
+
+    def list_range(self, path, recurse=0):
+        """
+        List keys and their values under given path.
+
+        :param path: Prefix of keys to query. Append '/' to list
+           child paths.
+        :param recurse: Children depths to include in search
+        :returns: sorted list of (key, value) pairs
+        """
+        return self.backend.list_range(path, recurse=recurse)
+
+    def create(self, path, value, lease=None):
+        """Create a key and initialise it with the value.
+
+        Fails if the key already exists.
+
+        :param path: Path to create
+        :param value: Value to set
+        :param lease: Lease to associate (ignored)
+        :raises: Collision
+        """
+        self.backend.create(path, value, lease)
+
+    def update(self, path, value):
+        """
+        Update an existing key. Fails if the key does not exist.
+
+        :param path: Path to update
+        :param value: Value to set
+        :raises: Vanished
+        """
+        self.backend.update(path, value)
+
+    def delete(self, path, must_exist=True):
+        """
+        Delete the given key.
+
+        :param path: Path of key to remove
+        :param must_exist: Fail if path does not exist?
+        """
+        self.backend.delete(path, must_exist=must_exist)
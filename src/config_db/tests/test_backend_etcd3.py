@@ -471,6 +471,37 @@ def test_transaction_list(etcd3):
     etcd3.delete(key, recursive=True, must_exist=False)
 
 
+def test_transaction_list_range(etcd3):
+
+    key = PREFIX + "/test_txn_list_range"
+    keys = [key+"/"+str(i) for i in range(5)]
+    for txn in etcd3.txn():
+        for k in keys:
+            txn.create(k, k)
+            txn.create(k+"/sub", k+"/sub")
+
+    # Ensure that we can list keys together with their values
+    assert etcd3.list_range(key+'/')[0] == [
+        (k, k, etcd3.get(k)[1].mod_revision) for k in keys]
+    for txn in etcd3.txn():
+        assert txn.list_range(key+'/') == [(k, k) for k in keys]
+        assert txn.list_range(key+'/', recurse=1) == sorted(
+            [(k, k) for k in keys] + [(k+"/sub", k+"/sub") for k in keys])
+        assert txn.list_range(key+'/', recurse=(1,)) == [
+            (k+"/sub", k+"/sub") for k in keys]
+
+    # Uncommitted updates should be reflected in the result
+    for txn in etcd3.txn():
+        txn.create(key+"/xxx", "xxx")
+        txn.update(keys[0], "updated")
+        txn.delete(keys[1])
+        assert txn.list_range(key+'/') == sorted(
+            [(keys[0], "updated"), (key+"/xxx", "xxx")] +
+            [(k, k) for k in keys[2:]])
+
+    etcd3.delete(key, recursive=True, must_exist=False)
+
+
 # pylint: disable=W0212
 @pytest.mark.timeout(2)
 def test_transaction_wait(etcd3):
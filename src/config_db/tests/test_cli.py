@@ -81,6 +81,14 @@ def test_cli_simple(capsys):
     assert out == "OK\n"
     assert err == ""
 
+    # Recursive delete accepts a prefix ending with '/'
+    cli.main(['create', PREFIX+'/sub/test', 'asdf'])
+    out, err = capsys.readouterr()
+    cli.main(['delete', '-R', PREFIX+'/sub/'])
+    out, err = capsys.readouterr()
+    assert out == PREFIX+"/sub/test\nOK\n"
+    assert err == ""
+
 
 if __name__ == '__main__':
     pytest.main()
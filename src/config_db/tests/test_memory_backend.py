@@ -0,0 +1,259 @@
+"""Tests for in-memory backend."""
+
+# pylint: disable=missing-docstring,redefined-outer-name,invalid-name
+
+import pytest
+
+from ska_sdp_config import backend, memory_backend
+
+PREFIX = "/__test_memory"
+
+
+@pytest.fixture
+def memory():
+    # The store is shared process-wide, so scrub our prefix before and
+    # after every test to keep them independent.
+    with memory_backend.MemoryBackend() as memory:
+        memory.delete(PREFIX, must_exist=False, recursive=True, prefix=True)
+        yield memory
+        memory.delete(PREFIX, must_exist=False, recursive=True, prefix=True)
+
+
+def test_valid(memory):
+    with pytest.raises(ValueError, match="must start"):
+        memory.create("", "")
+    with pytest.raises(ValueError, match="must start"):
+        memory.create("foo", "")
+
+
+def test_create(memory):
+    key = PREFIX + "/test_create"
+
+    memory.create(key, "foo")
+    with pytest.raises(backend.Collision):
+        memory.create(key, "foo")
+
+    # Check value
+    assert memory.get(key) == "foo"
+
+    # Update, check again
+    memory.update(key, "bar")
+    assert memory.get(key) == "bar"
+
+    # Values are stored as strings
+    memory.update(key, 5)
+    assert memory.get(key) == "5"
+
+    # Cannot update a key that does not exist
+    with pytest.raises(backend.Vanished):
+        memory.update(key + "x", "baz")
+
+    # Delete key
+    memory.delete(key)
+    assert memory.get(key) is None
+    with pytest.raises(backend.Vanished):
+        memory.delete(key)
+
+
+def test_shared(memory):
+    key = PREFIX + "/test_shared"
+
+    # Separate client instances see the same data, as separate
+    # connections to one database would
+    memory.create(key, "foo")
+    with memory_backend.MemoryBackend() as other:
+        assert other.get(key) == "foo"
+        other.delete(key)
+    assert memory.get(key) is None
+
+
+def test_list(memory):
+
+    key = PREFIX + "/test_list"
+
+    # Create a bunch of keys
+    memory.create(key+"/a", "")
+    memory.create(key+"/ab", "")
+    memory.create(key+"/b", "")
+    memory.create(key+"/ax", "")
+    memory.create(key+"/ab/c", "")
+    memory.create(key+"/a/d", "")
+    memory.create(key+"/a/d/x", "")
+
+    # Try listing
+    assert memory.list_keys(key+'/') == [
+        key+"/a", key+"/ab", key+"/ax", key+"/b"]
+    assert memory.list_keys(key) == []
+    assert memory.list_keys(key+"/a") == [
+        key+"/a", key+"/ab", key+"/ax"]
+    assert memory.list_keys(key+"/b") == [
+        key+"/b"]
+    assert memory.list_keys(key+"/a/") == [
+        key+"/a/d"]
+    assert memory.list_keys(key+"/ab/") == [
+        key+"/ab/c"]
+    assert memory.list_keys(key+"/ab") == [
+        key+"/ab"]
+
+    # Try listing recursively
+    assert memory.list_keys(key, recurse=1) == [
+        key+"/a", key+"/ab", key+"/ax", key+"/b"]
+    assert memory.list_keys(key, recurse=(1,)) == [
+        key+"/a", key+"/ab", key+"/ax", key+"/b"]
+    assert memory.list_keys(key, recurse=2) == [
+        key+"/a", key+"/a/d", key+"/ab", key+"/ab/c",
+        key+"/ax", key+"/b"]
+    assert memory.list_keys(key, recurse=(2,)) == [
+        key+"/a/d", key+"/ab/c"]
+    assert memory.list_keys(key+"/", recurse=1) == [
+        key+"/a", key+"/a/d", key+"/ab", key+"/ab/c",
+        key+"/ax", key+"/b"]
+    assert memory.list_keys(key, recurse=3) == [
+        key+"/a", key+"/a/d", key+"/a/d/x",
+        key+"/ab", key+"/ab/c", key+"/ax", key+"/b"]
+    assert memory.list_keys(key, recurse=[3, 2, 1]) == [
+        key+"/a", key+"/a/d", key+"/a/d/x",
+        key+"/ab", key+"/ab/c", key+"/ax", key+"/b"]
+    assert memory.list_keys(key+"/a", recurse=2) == [
+        key+"/a", key+"/a/d", key+"/a/d/x",
+        key+"/ab", key+"/ab/c", key+"/ax"]
+    assert memory.list_keys(key+"/a/", recurse=1) == [
+        key+"/a/d", key+"/a/d/x"]
+    assert set(memory.list_keys("/", recurse=32)) >= set([
+        key+"/a", key+"/a/d", key+"/a/d/x",
+        key+"/ab", key+"/ab/c", key+"/ax"])
+
+    # Remove
+    memory.delete(key, must_exist=False, recursive=True)
+
+
+def test_list_range(memory):
+
+    key = PREFIX + "/test_list_range"
+
+    memory.create(key+"/a", "1")
+    memory.create(key+"/b", "2")
+    memory.create(key+"/a/c", "3")
+
+    # Keys should get listed together with their values
+    assert memory.list_range(key+'/') == [
+        (key+"/a", "1"), (key+"/b", "2")]
+    assert memory.list_range(key+'/', recurse=1) == [
+        (key+"/a", "1"), (key+"/a/c", "3"), (key+"/b", "2")]
+    assert memory.list_range(key+'/', recurse=(1,)) == [
+        (key+"/a/c", "3")]
+
+    memory.delete(key, must_exist=False, recursive=True, prefix=True)
+
+
+def test_lease(memory):
+    key = PREFIX + "/test_lease"
+    with memory.lease(ttl=5) as lease:
+        memory.create(key, "blub", lease=lease)
+        with pytest.raises(backend.Collision):
+            memory.create(key, "blub", lease=lease)
+        assert lease.alive()
+    # Key should have been removed by lease expiring
+    with pytest.raises(backend.Vanished):
+        memory.delete(key)
+
+
+def test_delete(memory):
+
+    key = PREFIX + "/test_delete"
+
+    # Two passes - with and without deleting keys by PREFIX
+    for del_PREFIX in [False, True]:
+
+        # Create deeply recursive structure
+        childs = ["/".join([key] + n * ['x']) for n in range(10)]
+        for n, child in enumerate(childs):
+            memory.create(child, n)
+
+        # Create some keys in a parallel structure sharing a PREFIX
+        if not del_PREFIX:
+            memory.create(key + "x", "keep!")
+            memory.create(key + "x/x", "keep!")
+
+        # Delete root
+        memory.delete(key, prefix=del_PREFIX)
+        for n, child in enumerate(childs):
+            if n > 0:
+                assert memory.get(child) == str(n), child
+        assert (memory.get(key + "x") is None) == del_PREFIX
+        assert memory.get(key + "x/x") == "keep!"
+
+        # This should fail now
+        with pytest.raises(backend.Vanished):
+            memory.delete(key, recursive=True, must_exist=True,
+                          prefix=del_PREFIX)
+        for n, child in enumerate(childs):
+            if n > 0:
+                assert memory.get(child) == str(n), child
+        assert (memory.get(key + "x") is None) == del_PREFIX
+        assert memory.get(key + "x/x") == "keep!"
+
+        # But this one should work, and remove remaining keys
+        # (except those with the same PREFIX but different path
+        #  unless we set the option before)
+        memory.delete(key, recursive=True, must_exist=False,
+                      prefix=del_PREFIX)
+        for child in childs:
+            assert memory.get(child) is None, child
+        assert (memory.get(key + "x") is None) == del_PREFIX
+        assert (memory.get(key + "x/x") is None) == del_PREFIX
+
+
+def test_transaction(memory):
+
+    key = PREFIX + "/test_txn"
+    key2 = PREFIX + "/test_txn/2"
+
+    # Make sure we can do simple things, like reading a key
+    for txn in memory.txn():
+        txn.create(key, "test")
+    assert memory.get(key) == "test"
+    for txn in memory.txn():
+        assert txn.get(key) == "test"
+        txn.update(key, "test2")
+        assert txn.get(key) == "test2"
+    assert memory.get(key) == "test2"
+
+    for txn in memory.txn():
+        assert txn.get(key2) is None
+        txn.create(key2, "test2")
+        assert txn.list_keys(key + "/") == [key2]
+        assert txn.list_range(key + "/") == [(key2, "test2")]
+        txn.delete(key2)
+        with pytest.raises(backend.Vanished):
+            txn.delete(key2)
+        with pytest.raises(backend.Collision):
+            txn.create(key, "test")
+        # Watches are not supported, so this is a no-op
+        txn.loop(watch=True)
+
+    memory.delete(key, recursive=True, must_exist=False)
+
+
+def test_transaction_commit(memory):
+
+    key = PREFIX + "/test_txn_commit"
+
+    counter = {'i': 0}
+
+    def increase_counter():
+        counter['i'] += 1
+
+    # Transactions trivially succeed, so the commit callback should
+    # get invoked exactly once
+    for i, txn in enumerate(memory.txn()):
+        txn.on_commit(increase_counter)
+        txn.create(key, "1")
+    assert i == 0
+    assert counter['i'] == 1
+
+    memory.delete(key)
+
+
+if __name__ == '__main__':
+    pytest.main()
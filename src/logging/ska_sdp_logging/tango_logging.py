@@ -3,13 +3,16 @@
 # pylint: disable=too-few-public-methods
 # pylint: disable=fixme
 
-import inspect
+import collections
+import functools
 import logging
 import pathlib
+import sys
 import threading
 import typing
+import weakref
 
-import tango.server
+import tango
 
 from . import core_logging
 
@@ -23,6 +26,22 @@ _TANGO_TO_PYTHON = {
 }
 
 
+@functools.lru_cache(maxsize=128)
+def _basename(filename: str) -> str:
+    """Get the base name of a file path.
+
+    Cached, as log records keep coming from the same few files.
+
+    :param filename: file path
+    :returns: base name
+    """
+    return pathlib.Path(filename).name
+
+
+# Caller information remembered for formatting a log record
+_Frame = collections.namedtuple('_Frame', 'function filename lineno')
+
+
 def to_python_level(tango_level: tango.LogLevel) -> int:
     """Convert a TANGO log level to a Python one.
 
@@ -35,13 +54,16 @@ def to_python_level(tango_level: tango.LogLevel) -> int:
 class LogManager:
     """Redirect log messages.
 
-    This is redundant from Python 3.8 as the logging module then supports
-    a "stacklevel" keyword.
+    Only used on Python versions before 3.8: from 3.8 the logging
+    module supports a "stacklevel" keyword that makes the frame
+    bookkeeping here redundant.
     """
 
     def __init__(self):
         """Initialise the constructor."""
-        self.frames = {}
+        # Weak keys, so that entries disappear with their threads
+        # instead of accumulating over the lifetime of the server.
+        self.frames = weakref.WeakKeyDictionary()
 
     def make_fn(self, level: int) -> typing.Callable:
         """Create a redirection function.
@@ -52,17 +74,20 @@ class LogManager:
         return lambda _, msg, *args: self._log_it(level, msg, *args)
 
     def _log_it(self, level: int, msg: str, *args) -> None:
-        # There are two levels of indirection.
-        # Remember the right frame in a thread-safe way.
-        self.frames[threading.current_thread()] = inspect.stack()[2]
+        # There are two levels of indirection. Remember the right frame
+        # in a thread-safe way. Note that sys._getframe only inspects
+        # the frames we ask for, where inspect.stack() would walk (and
+        # read source lines for) the entire call stack.
+        frame = sys._getframe(2)  # pylint: disable=protected-access
+        self.frames[threading.current_thread()] = _Frame(
+            frame.f_code.co_name, frame.f_code.co_filename, frame.f_lineno)
         logging.log(level, msg, *args)
 
 
 class TangoFormatter(core_logging.SkaFormatter):
     """Replace the stack frame with the right one.
 
-    This is redundant from Python 3.8 as the logging module then supports
-    a "stacklevel" keyword.
+    Only used on Python versions before 3.8, see :class:`LogManager`.
     """
 
     def __init__(self, *tags):
@@ -75,13 +100,13 @@ class TangoFormatter(core_logging.SkaFormatter):
         if record.pathname == __file__:
             frame = self.log_man.frames[threading.current_thread()]
             record.funcName = frame.function
-            record.filename = pathlib.Path(frame.filename).name
+            record.filename = _basename(frame.filename)
             record.lineno = frame.lineno
         return super().format(record)
 
 
 def init(level=tango.LogLevel.LOG_INFO, name=None, device_name='',
-         device_class=tango.server.Device) -> logging.Logger:
+         device_class=None) -> logging.Logger:
     """Initialise logging for a TANGO device.
 
     This modifies the logging behaviour of the device class.
@@ -92,13 +117,33 @@ def init(level=tango.LogLevel.LOG_INFO, name=None, device_name='',
     :param device_class: class object. default: tango.server.Device
     :returns: logger object
     """
+    # Import deferred to here so that importing this module (e.g. for
+    # to_python_level) does not pay for the tango.server import.
+    if device_class is None:
+        import tango.server
+        device_class = tango.server.Device
+
     # Monkey patch the tango device logging to redirect to python.
-    fmt = TangoFormatter(device_name)
-    device_class.debug_stream = fmt.log_man.make_fn(logging.DEBUG)
-    device_class.info_stream = fmt.log_man.make_fn(logging.INFO)
-    device_class.warn_stream = fmt.log_man.make_fn(logging.WARNING)
-    device_class.error_stream = fmt.log_man.make_fn(logging.ERROR)
-    device_class.fatal_stream = fmt.log_man.make_fn(logging.CRITICAL)
+    if sys.version_info >= (3, 8):
+        # The logging module can attribute the record to the device
+        # code itself via "stacklevel", so no frame bookkeeping is
+        # needed. Before Python 3.11 the module-level logging.log
+        # function counts towards the stack level, so one extra level
+        # is needed to step past it and the lambda below.
+        stacklevel = 2 if sys.version_info >= (3, 11) else 3
+
+        def make_fn(level: int) -> typing.Callable:
+            return lambda _, msg, *args: logging.log(
+                level, msg, *args, stacklevel=stacklevel)
+        fmt = core_logging.SkaFormatter(device_name)
+    else:
+        fmt = TangoFormatter(device_name)
+        make_fn = fmt.log_man.make_fn
+    device_class.debug_stream = make_fn(logging.DEBUG)
+    device_class.info_stream = make_fn(logging.INFO)
+    device_class.warn_stream = make_fn(logging.WARNING)
+    device_class.error_stream = make_fn(logging.ERROR)
+    device_class.fatal_stream = make_fn(logging.CRITICAL)
 
     # Now initialise the logging.
     log = core_logging.init(name=name, level=to_python_level(level),
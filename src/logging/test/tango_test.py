@@ -11,12 +11,22 @@
 # pylint: disable=fixme
 
 import logging
+import sys
 import pytest
 
 from ska_sdp_logging import core_logging, tango_logging
 import core_test
 
 
+class RecordHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
 class FakeDevice:
     def info_stream(self, _: str, *args) -> None:
         print("info stream should not be called")
@@ -44,3 +54,21 @@ def test_tango_logging(init):
     for log_entry in hnd.list:
         record = core_logging.SkaLogRecord.from_string(log_entry)
         assert record.msg == "Running tango test"
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8),
+                    reason="attribution happens in the formatter")
+def test_caller_attribution(init):
+    log, _ = init
+    hnd = RecordHandler()
+    log.addHandler(hnd)
+    dev = FakeDevice()
+    # Records should be attributed to the code calling the stream
+    # method, not the redirection machinery.
+    dev.info_stream("attribution test")
+    lineno = sys._getframe().f_lineno - 1  # pylint: disable=protected-access
+    assert len(hnd.records) == 1
+    record = hnd.records[0]
+    assert record.funcName == "test_caller_attribution"
+    assert record.filename == "tango_test.py"
+    assert record.lineno == lineno
@@ -9,6 +9,7 @@ import os
 import sys
 import signal
 import logging
+import functools
 from enum import IntEnum, unique
 
 from ska_sdp_logging import tango_logging
@@ -216,6 +217,16 @@ class SDPMaster(Device):
         return env_var
 
 
+@functools.lru_cache(maxsize=1)
+def _tango_db() -> Database:
+    """Get the Tango database client.
+
+    Cached, as constructing a Database object opens a new connection
+    to the Tango database.
+    """
+    return Database()
+
+
 def delete_device_server(instance_name: str = "*"):
     """Delete (unregister) SDPMaster device server instance(s).
 
@@ -224,10 +235,10 @@ def delete_device_server(instance_name: str = "*"):
                           be removed.
     """
     try:
-        tango_db = Database()
+        tango_db = _tango_db()
         class_name = 'SDPMaster'
         server_name = '{}/{}'.format(class_name, instance_name)
-        for server_name in list(tango_db.get_server_list(server_name)):
+        for server_name in tango_db.get_server_list(server_name):
             LOG.info('Removing device server: %s', server_name)
             tango_db.delete_server(server_name)
     except ConnectionFailed:
@@ -243,10 +254,10 @@ def register(instance_name: str, device_name: str):
     :param device_name: Master device name to register
     """
     try:
-        tango_db = Database()
+        tango_db = _tango_db()
         class_name = 'SDPMaster'
         server_name = '{}/{}'.format(class_name, instance_name)
-        devices = list(tango_db.get_device_name(server_name, class_name))
+        devices = tango_db.get_device_name(server_name, class_name)
         device_info = DbDevInfo()
         # pylint: disable=protected-access
         device_info._class = class_name
@@ -11,6 +11,7 @@ import sys
 import time
 import signal
 import logging
+import functools
 import json
 from enum import IntEnum, unique
 import jsonschema
@@ -264,9 +265,14 @@ class SDPSubarray(Device):
         """
         pb_state_list = []
 
-        if self._config_db_client is not None:
-            for pb_id in self._pb_realtime:
-                for txn in self._config_db_client.txn():
+        if self._config_db_client is not None and self._pb_realtime:
+            for txn in self._config_db_client.txn():
+                # Read all states in one transaction rather than one
+                # per processing block. This saves database round trips
+                # and gives a consistent snapshot. Reset the list in
+                # case the transaction has to repeat.
+                pb_state_list = []
+                for pb_id in self._pb_realtime:
                     pb_state = txn.get_processing_block_state(pb_id).copy()
                     pb_state['id'] = pb_id
                     pb_state_list.append(pb_state)
@@ -722,6 +728,7 @@ class SDPSubarray(Device):
 
         cbf_outlink_address = None
         pb_receive_addresses = None
+        pb_list = []
 
         for pbc in config.get('processingBlocks'):
             pb_id = pbc.get('id')
@@ -770,18 +777,24 @@ class SDPSubarray(Device):
                 LOG.error('dependencies attribute must not appear in '
                           'real-time processing block configuration')
 
-            # Create processing block with empty state
+            # Collect processing block to be created
             if self._config_db_client is not None:
-                pb = ska_sdp_config.ProcessingBlock(
+                pb_list.append(ska_sdp_config.ProcessingBlock(
                     pb_id=pb_id,
                     sbi_id=sbi_id,
                     workflow=workflow,
                     parameters=pbc.get('parameters'),
                     scan_parameters=scan_parameters
-                )
-                for txn in self._config_db_client.txn():
+                ))
+
+        # Create the processing blocks with empty state in the config DB.
+        # Using a single transaction (rather than one per processing
+        # block) creates them atomically and in one database round trip.
+        if pb_list:
+            for txn in self._config_db_client.txn():
+                for pb in pb_list:
                     txn.create_processing_block(pb)
-                    txn.create_processing_block_state(pb_id, {})
+                    txn.create_processing_block_state(pb.pb_id, {})
 
         if self.is_feature_active(FeatureToggle.CBF_OUTPUT_LINK) \
                 and self._config_db_client is not None:
@@ -915,6 +928,16 @@ class SDPSubarray(Device):
         self._pb_receive_addresses = None
 
 
+@functools.lru_cache(maxsize=1)
+def _tango_db():
+    """Get the Tango database client.
+
+    Cached, as constructing a Database object opens a new connection
+    to the Tango database.
+    """
+    return Database()
+
+
 def delete_device_server(instance_name='*'):
     """Delete (unregister) SDPSubarray device server instance(s).
 
@@ -924,10 +947,10 @@ def delete_device_server(instance_name='*'):
 
     """
     try:
-        tango_db = Database()
+        tango_db = _tango_db()
         class_name = 'SDPSubarray'
         server_name = '{}/{}'.format(class_name, instance_name)
-        for server_name in list(tango_db.get_server_list(server_name)):
+        for server_name in tango_db.get_server_list(server_name):
             LOG.info('Removing device server: %s', server_name)
             tango_db.delete_server(server_name)
     except ConnectionFailed:
@@ -945,10 +968,11 @@ def register(instance_name, *device_names):
     """
     # pylint: disable=protected-access
     try:
-        tango_db = Database()
+        tango_db = _tango_db()
         class_name = 'SDPSubarray'
         server_name = '{}/{}'.format(class_name, instance_name)
-        devices = list(tango_db.get_device_name(server_name, class_name))
+        # Set, as membership is checked once per device name below.
+        devices = set(tango_db.get_device_name(server_name, class_name))
         device_info = DbDevInfo()
         device_info._class = class_name
         device_info.server = server_name
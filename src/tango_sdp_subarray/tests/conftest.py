@@ -3,11 +3,34 @@
 
 # from unittest.mock import MagicMock
 
+import logging
+import os
+
 import pytest
-from tango.test_context import DeviceTestContext
 
-from SDPSubarray import SDPSubarray
-from SDPSubarray.release import VERSION
+# Ignore this test package if PyTango is not installed, so that
+# running the wider test tree still collects and runs everything else
+# cleanly instead of failing on the device server module import.
+try:
+    from tango.test_context import DeviceTestContext
+
+    from SDPSubarray import SDPSubarray
+    from SDPSubarray.release import VERSION
+except ImportError:
+    collect_ignore_glob = ['*']
+
+
+@pytest.fixture(scope='session', autouse=True)
+def quiet_logging():
+    """Fixture that suppresses device logging below WARNING.
+
+    The device logs every command and polled attribute read at INFO or
+    DEBUG; formatting and emitting those records slows the tests down
+    without aiding debugging of passing runs.
+    """
+    logging.disable(logging.INFO)
+    yield
+    logging.disable(logging.NOTSET)
 
 
 @pytest.fixture(scope='session', autouse=True)
@@ -26,9 +49,16 @@ def tango_context():
 
     device_name = 'mid_sdp/elt/subarray_1'
     properties = dict(Version=VERSION)
-    tango_context = DeviceTestContext(SDPSubarray,
-                                      device_name=device_name,
-                                      properties=properties)
+    context_kwargs = dict(device_name=device_name, properties=properties)
+
+    # Give each pytest-xdist worker its own device server port, so the
+    # scenarios can run in parallel ('pytest -n auto') without the
+    # workers colliding on the socket.
+    worker = os.environ.get('PYTEST_XDIST_WORKER', '')
+    if worker.startswith('gw'):
+        context_kwargs['port'] = 45450 + int(worker[2:])
+
+    tango_context = DeviceTestContext(SDPSubarray, **context_kwargs)
     print()
     print('Starting context...')
     tango_context.start()
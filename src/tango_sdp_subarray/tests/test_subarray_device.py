@@ -5,9 +5,9 @@
 # pylint: disable=protected-access
 # pylint: disable=fixme
 
+import functools
 import json
-from os.path import dirname, join
-from unittest.mock import MagicMock
+from pathlib import Path
 
 import tango
 from tango import DevState
@@ -22,6 +22,12 @@ try:
 except ImportError:
     ska_sdp_config = None
 
+# Use the faster C JSON parser when it is available.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 # -----------------------------------------------------------------------------
 # Scenarios : Specify what we want the software to do
@@ -31,39 +37,151 @@ except ImportError:
 scenarios('./1_XR-11.feature')
 
 
+# -----------------------------------------------------------------------------
+# Step parsers, built once rather than per decorator evaluation
+# -----------------------------------------------------------------------------
+
+_HAVE_DEVICE = parsers.parse('I have an {admin_mode_value} SDPSubarray device')
+_SET_ADMIN_MODE = parsers.parse('I set adminMode to {value}')
+_SET_OBS_STATE = parsers.parse('obsState is {value}')
+_STATE_EQUALS = parsers.parse('State should be {expected}')
+_OBS_STATE_EQUALS = parsers.parse('obsState should be {expected}')
+_ADMIN_MODE_EQUALS = parsers.parse('adminMode should be {expected}')
+_HEALTH_STATE_EQUALS = parsers.parse('healthState should be {expected}')
+
+
+# -----------------------------------------------------------------------------
+# Test data
+# -----------------------------------------------------------------------------
+
+# Device states by name; DevState.names goes through the descriptor
+# protocol on every access, so take a copy. The enum tables likewise
+# save the EnumMeta lookup machinery in the step functions.
+_DEV_STATE_BY_NAME = dict(DevState.names)
+_ADMIN_MODE_BY_NAME = dict(AdminMode.__members__)
+_OBS_STATE_BY_NAME = dict(ObsState.__members__)
+_HEALTH_STATE_BY_NAME = dict(HealthState.__members__)
+
+# Directory containing the test data files.
+_DATA_DIR = Path(__file__).resolve().parent / 'data'
+
+# Command arguments, read once instead of on every step invocation.
+_CONFIGURE_STR = (_DATA_DIR / 'command_Configure.json').read_text()
+_CONFIGURE_SCAN_STR = (_DATA_DIR / 'command_ConfigureScan.json').read_text()
+
+# Channel link map returned by the mocked _get_channel_link_map method.
+_CHANNEL_LINK_MAP = json.loads(
+    (_DATA_DIR / 'attr_cbfOutputLink-simple.json').read_text())
+
+# Expected receiveAddresses payloads, parsed once.
+_EXPECTED_RA_NO_CBF_OUTPUT_LINK = json_loads(
+    (_DATA_DIR / 'attr_receiveAddresses-cbfOutputLink-disabled.json')
+    .read_bytes())
+_EXPECTED_RA_SIMPLE = json_loads(
+    (_DATA_DIR / 'attr_receiveAddresses-simple.json').read_bytes())
+
+
 # -----------------------------------------------------------------------------
 # Mock functions
 # -----------------------------------------------------------------------------
 
-def mock_get_channel_link_map(scan_id):
-    """Mock replacement for SDPSubarray device _get_channel_link_map method."""
-    config_file = 'attr_cbfOutputLink-simple.json'
-    path = join(dirname(__file__), 'data', config_file)
-    with open(path, 'r') as file:
-        channel_link_map = json.load(file)
+# Command introspection results, cached for the session. Querying the
+# command list or a command's configuration is a device server round
+# trip each time.
+_COMMAND_LIST = None
+_COMMAND_CONFIGS = {}
+
+
+def _command_list(device):
+    """Get the device's command list, querying it at most once.
+
+    :param device: An SDPSubarray device.
+    :returns: set of command names
+    """
+    # pylint: disable=global-statement
+    global _COMMAND_LIST
+    if _COMMAND_LIST is None:
+        _COMMAND_LIST = set(device.get_command_list())
+    return _COMMAND_LIST
+
+
+def _command_config(device, name):
+    """Get a command's configuration, querying it at most once.
+
+    :param device: An SDPSubarray device.
+    :param name: Name of the command.
+    :returns: command configuration
+    """
+    if name not in _COMMAND_CONFIGS:
+        _COMMAND_CONFIGS[name] = device.get_command_config(name)
+    return _COMMAND_CONFIGS[name]
+
+
+@functools.lru_cache(maxsize=1)
+def _config_db_client():
+    """Get the config DB client shared by the test session.
+
+    Each client opens its own connection to the database, so steps
+    should use this rather than constructing their own.
+    """
+    return ska_sdp_config.Config()
+
+
+def mock_get_channel_link_map(self, scan_id):
+    """Mock replacement for SDPSubarray device _get_channel_link_map method.
+
+    A plain function rather than a MagicMock, as no test asserts on
+    the call arguments and a direct call is much cheaper.
+    """
+    # pylint: disable=unused-argument
+    # Copy, so that patching in the scan ID leaves the cached map alone.
+    channel_link_map = dict(_CHANNEL_LINK_MAP)
     channel_link_map['scanID'] = scan_id
     return channel_link_map
 
 
+@pytest.fixture(scope='session', autouse=True)
+def _mock_channel_link_map():
+    """Mock the SDPSubarray._get_channel_link_map() method.
+
+    Patched once for the whole session so that the device does not need
+    to connect to a CSP subarray device, rather than creating a fresh
+    mock in every scenario.
+    """
+    SDPSubarray._get_channel_link_map = mock_get_channel_link_map
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _verify_command_signatures(tango_context):
+    """Check the resource command signatures once per session.
+
+    The commands must exist, take a string, and not return a value.
+    This metadata cannot change while the device server is up, so
+    there is no need to re-assert it in every scenario.
+    """
+    device = tango_context.device
+    commands = _command_list(device)
+    assert 'AssignResources' in commands
+    assert 'ReleaseResources' in commands
+    command_info = _command_config(device, 'AssignResources')
+    assert command_info.in_type == tango.DevString
+    assert command_info.out_type == tango.DevVoid
+
+
 # -----------------------------------------------------------------------------
 # Given Steps : Used to describe the initial context of the system.
 # -----------------------------------------------------------------------------
 
 
-@given(parsers.parse('I have an {admin_mode_value} SDPSubarray device'))
+@given(_HAVE_DEVICE)
 def subarray_device(tango_context, admin_mode_value: str):
     """Get a SDPSubarray device object
 
     :param tango_context: fixture providing a TangoTestContext
     :param admin_mode_value: adminMode value the device is created with
     """
-    # Mock the SDPSubarray._get_channel_link_map() method so that
-    # it does not need to connect to a CSP subarray device.
-    SDPSubarray._get_channel_link_map = MagicMock(
-        side_effect=mock_get_channel_link_map
-    )
     tango_context.device.Init()
-    tango_context.device.adminMode = AdminMode[admin_mode_value]
+    tango_context.device.adminMode = _ADMIN_MODE_BY_NAME[admin_mode_value]
     return tango_context.device
 
 
@@ -81,30 +199,25 @@ def init_device(subarray_device):
     subarray_device.Init()
 
 
-@when(parsers.parse('I set adminMode to {value}'))
+@when(_SET_ADMIN_MODE)
 def set_admin_mode(subarray_device, value: str):
     """Set the adminMode to the specified value.
 
     :param subarray_device: An SDPSubarray device.
     :param value: Value to set the adminMode attribute to.
     """
-    subarray_device.adminMode = AdminMode[value]
+    subarray_device.adminMode = _ADMIN_MODE_BY_NAME[value]
 
 
 @when('I call AssignResources')
 def command_assign_resources(subarray_device):
     """Call the AssignResources command.
 
-    This requires that the device exists, takes a string, and does not
-    return a value.
+    The command signature is checked by the _verify_command_signatures
+    fixture.
 
     :param subarray_device: An SDPSubarray device.
     """
-    assert 'AssignResources' in subarray_device.get_command_list()
-    command_info = subarray_device.get_command_config('AssignResources')
-    assert command_info.in_type == tango.DevString
-    assert command_info.out_type == tango.DevVoid
-
     # For SDP assign resources is a noop so can be called with an empty string.
     subarray_device.AssignResources('')
 
@@ -115,13 +228,12 @@ def command_release_resources(subarray_device):
 
     :param subarray_device: An SDPSubarray device.
     """
-    assert 'ReleaseResources' in subarray_device.get_command_list()
     # For SDP release resources is a noop so can be called with an empty
     # string.
     subarray_device.ReleaseResources('')
 
 
-@when(parsers.parse('obsState is {value}'))
+@when(_SET_OBS_STATE)
 @when('obsState is <value>')
 def set_obs_state(subarray_device, value):
     """Set the obsState attribute to the {commanded state}.
@@ -129,7 +241,7 @@ def set_obs_state(subarray_device, value):
     :param subarray_device: An SDPSubarray device.
     :param value: An SDPSubarray ObsState enum string.
     """
-    subarray_device.obsState = ObsState[value]
+    subarray_device.obsState = _OBS_STATE_BY_NAME[value]
 
 
 @when('I call Configure')
@@ -138,11 +250,7 @@ def command_configure(subarray_device):
 
     :param subarray_device: An SDPSubarray device.
     """
-    config_file = 'command_Configure.json'
-    path = join(dirname(__file__), 'data', config_file)
-    with open(path, 'r') as file:
-        config_str = file.read()
-    subarray_device.Configure(config_str)
+    subarray_device.Configure(_CONFIGURE_STR)
 
 
 @when('I call Configure with invalid JSON')
@@ -161,11 +269,7 @@ def command_configure_scan(subarray_device):
 
     :param subarray_device: An SDPSubarray device.
     """
-    config_file = 'command_ConfigureScan.json'
-    path = join(dirname(__file__), 'data', config_file)
-    with open(path, 'r') as file:
-        config_str = file.read()
-    subarray_device.ConfigureScan(config_str)
+    subarray_device.ConfigureScan(_CONFIGURE_SCAN_STR)
 
 
 @when('I call Scan')
@@ -203,34 +307,34 @@ def command_end_sb(subarray_device):
 # -----------------------------------------------------------------------------
 
 
-@then(parsers.parse('State should be {expected}'))
+@then(_STATE_EQUALS)
 def device_state_equals(subarray_device, expected):
     """Check the Subarray device device state.
 
     :param subarray_device: An SDPSubarray device.
     :param expected: The expected device state.
     """
-    assert subarray_device.state() == DevState.names[expected]
+    assert subarray_device.state() == _DEV_STATE_BY_NAME[expected]
 
 
-@then(parsers.parse('obsState should be {expected}'))
+@then(_OBS_STATE_EQUALS)
 def obs_state_equals(subarray_device, expected):
     """Check the Subarray obsState attribute value.
 
     :param subarray_device: An SDPSubarray device.
     :param expected: The expected obsState.
     """
-    assert subarray_device.obsState == ObsState[expected]
+    assert subarray_device.obsState == _OBS_STATE_BY_NAME[expected]
 
 
-@then(parsers.parse('adminMode should be {expected}'))
+@then(_ADMIN_MODE_EQUALS)
 def admin_mode_equals(subarray_device, expected):
     """Check the Subarray adminMode value.
 
     :param subarray_device: An SDPSubarray device.
     :param expected: The expected adminMode.
     """
-    assert subarray_device.adminMode == AdminMode[expected], \
+    assert subarray_device.adminMode == _ADMIN_MODE_BY_NAME[expected], \
         "actual != expected"
 
 
@@ -244,14 +348,14 @@ def admin_mode_online_or_maintenance(subarray_device):
                                          AdminMode.MAINTENANCE)
 
 
-@then(parsers.parse('healthState should be {expected}'))
+@then(_HEALTH_STATE_EQUALS)
 def health_state_equals(subarray_device, expected):
     """Check the Subarray healthState value.
 
     :param subarray_device: An SDPSubarray device.
     :param expected: The expected heathState.
     """
-    assert subarray_device.healthState == HealthState[expected]
+    assert subarray_device.healthState == _HEALTH_STATE_BY_NAME[expected]
     if expected == 'OK':
         assert subarray_device.healthState == 0
 
@@ -284,10 +388,8 @@ def check_config_db():
     """
     if ska_sdp_config is not None \
             and SDPSubarray.is_feature_active('config_db'):
-        filename = join(dirname(__file__), 'data', 'command_Configure.json')
-        with open(filename, 'r') as file:
-            config = json.load(file)
-        config_db_client = ska_sdp_config.Config()
+        config = json.loads(_CONFIGURE_STR)
+        config_db_client = _config_db_client()
         for txn in config_db_client.txn():
             pb_ids = txn.list_processing_blocks()
         for pb in config['processingBlocks']:
@@ -302,26 +404,18 @@ def receive_addresses_attribute_ok(subarray_device):
     """
     receive_addresses = subarray_device.receiveAddresses
     # print(json.dumps(json.loads(receive_addresses), indent=2))
-    data_path = join(dirname(__file__), 'data')
 
     if ska_sdp_config is not None \
             and SDPSubarray.is_feature_active('config_db'):
-        expected_output_file = ''
         if not SDPSubarray.is_feature_active('cbf_output_link'):
-            expected_output_file = join(
-                data_path,
-                'attr_receiveAddresses-cbfOutputLink-disabled.json'
-                )
-        elif isinstance(SDPSubarray._get_channel_link_map, MagicMock):
-            expected_output_file = join(
-                data_path, 'attr_receiveAddresses-simple.json')
+            expected = _EXPECTED_RA_NO_CBF_OUTPUT_LINK
+        elif SDPSubarray._get_channel_link_map is mock_get_channel_link_map:
+            expected = _EXPECTED_RA_SIMPLE
         else:
             pytest.fail('Not yet able to test using a mock CSP Subarray '
                         'device')
 
-        with open(expected_output_file, 'r') as file:
-            expected = json.loads(file.read())
-        receive_addresses = json.loads(receive_addresses)
+        receive_addresses = json_loads(receive_addresses)
         assert receive_addresses == expected
 
 